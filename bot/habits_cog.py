@@ -3,6 +3,29 @@ from discord.ext import commands
 from discord.commands import Option, SlashCommandGroup
 from habits_db import HabitsDatabase
 
+# Discord rejects embeds that exceed these limits
+MAX_EMBED_FIELDS = 25
+MAX_FIELD_NAME_LENGTH = 256
+MAX_EMBED_LENGTH = 6000
+
+# Largest value SQLite can store in an INTEGER column
+SQLITE_MAX_INTEGER = 2**63 - 1
+
+def _as_choices(matches):
+    """Format (id, name) pairs as autocomplete choices, trimmed to Discord's 100 character limit"""
+    return [
+        discord.OptionChoice(name=f"#{item_id} - {name}"[:100], value=item_id)
+        for item_id, name in matches
+    ]
+
+async def habit_autocomplete(ctx: discord.AutocompleteContext):
+    """Suggest the invoking user's habits by name"""
+    return _as_choices(ctx.cog.db.search_user_habits(str(ctx.interaction.user.id), ctx.value or ""))
+
+async def todo_autocomplete(ctx: discord.AutocompleteContext):
+    """Suggest the invoking user's pending todos by title"""
+    return _as_choices(ctx.cog.db.search_user_todos(str(ctx.interaction.user.id), ctx.value or ""))
+
 class HabitsCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
@@ -45,7 +68,7 @@ class HabitsCog(commands.Cog):
     async def complete_habit(
         self,
         ctx: discord.ApplicationContext,
-        habit_id: Option(int, "ID of the habit to complete")
+        habit_id: Option(int, "ID of the habit to complete", autocomplete=habit_autocomplete)
     ):
         success = self.db.complete_habit(habit_id)
         if success:
@@ -63,6 +86,85 @@ class HabitsCog(commands.Cog):
             )
         await ctx.respond(embed=embed, ephemeral=True)
 
+    @habits.command(name="complete-many", description="Mark several habits as completed for today")
+    async def complete_many_habits(
+        self,
+        ctx: discord.ApplicationContext,
+        habit_ids: Option(str, "Comma-separated IDs of the habits to complete", required=False, default=None),
+        all_due: Option(bool, "Complete every habit due today", required=False, default=False)
+    ):
+        if all_due and habit_ids:
+            embed = discord.Embed(
+                title="Error",
+                description="Provide either a list of habit IDs or all_due, not both",
+                color=discord.Color.red()
+            )
+            await ctx.respond(embed=embed, ephemeral=True)
+            return
+
+        if all_due:
+            ids = None
+        else:
+            try:
+                # dict.fromkeys drops duplicate IDs while keeping their order
+                ids = list(dict.fromkeys(
+                    int(habit_id) for habit_id in (habit_ids or "").split(",") if habit_id.strip()
+                ))
+            except ValueError:
+                ids = []
+            if any(not 0 < habit_id <= SQLITE_MAX_INTEGER for habit_id in ids):
+                ids = []
+            if not ids or len(ids) > MAX_EMBED_FIELDS:
+                embed = discord.Embed(
+                    title="Error",
+                    description=f"Provide a comma-separated list of up to {MAX_EMBED_FIELDS} habit IDs or set all_due",
+                    color=discord.Color.red()
+                )
+                await ctx.respond(embed=embed, ephemeral=True)
+                return
+
+        completed = self.db.complete_habits(str(ctx.author.id), ids)
+        completed_ids = {habit['habit_id'] for habit in completed}
+        skipped = [habit_id for habit_id in ids or [] if habit_id not in completed_ids]
+        skipped_note = ""
+        if skipped:
+            skipped_list = ", ".join(f"#{habit_id}" for habit_id in skipped)
+            skipped_note = f"\nSkipped (already completed today or not found): {skipped_list}"
+
+        if not completed:
+            if ids is None:
+                description = "No habits are due today"
+            else:
+                description = f"Habits already completed for today or habits not found{skipped_note}"
+            embed = discord.Embed(
+                title="Error",
+                description=description,
+                color=discord.Color.red()
+            )
+        else:
+            title = "Habits Completed"
+            description = f"Completed {len(completed)} habit{'s' if len(completed) != 1 else ''}"
+            # Leave room for the title, description and a trailing "…and N more" line
+            budget = MAX_EMBED_LENGTH - len(title) - len(description) - len(skipped_note) - 100
+            fields = []
+            for habit in completed[:MAX_EMBED_FIELDS]:
+                name = f"#{habit['habit_id']} - {habit['habit_name']}"[:MAX_FIELD_NAME_LENGTH]
+                value = f"Current streak: {habit['streak']} days"
+                if len(name) + len(value) > budget:
+                    break
+                budget -= len(name) + len(value)
+                fields.append((name, value))
+            if len(completed) > len(fields):
+                description += f"\n…and {len(completed) - len(fields)} more not shown"
+            embed = discord.Embed(
+                title=title,
+                description=description + skipped_note,
+                color=discord.Color.green()
+            )
+            for name, value in fields:
+                embed.add_field(name=name, value=value, inline=False)
+        await ctx.respond(embed=embed, ephemeral=True)
+
     @habits.command(name="list", description="List all your habits")
     async def list_habits(self, ctx: discord.ApplicationContext):
         habits = self.db.get_user_habits(str(ctx.author.id))
@@ -114,7 +216,7 @@ class HabitsCog(commands.Cog):
     async def complete_todo(
         self,
         ctx: discord.ApplicationContext,
-        todo_id: Option(int, "ID of the todo to complete")
+        todo_id: Option(int, "ID of the todo to complete", autocomplete=todo_autocomplete)
     ):
         success = self.db.complete_todo(todo_id)
         if success:
@@ -5,14 +5,55 @@ from typing import List, Dict, Optional
 
 import sqlite3
 import os
+from bisect import bisect_left, insort
+from collections import OrderedDict
 from datetime import datetime, date
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+
+# Number of users whose autocomplete indexes are kept in memory at once
+MAX_CACHED_INDEXES = 256
+
+class PrefixIndex:
+    """Sorted in-memory index of item names for fast prefix lookups"""
+    def __init__(self):
+        self._entries: List[Tuple[str, int, str]] = []
+        self._keys: Dict[int, Tuple[str, int, str]] = {}
+
+    def add(self, item_id: int, name: str):
+        """Add an item, replacing any existing entry with the same id"""
+        self.remove(item_id)
+        entry = (name.casefold(), item_id, name)
+        insort(self._entries, entry)
+        self._keys[item_id] = entry
+
+    def remove(self, item_id: int):
+        """Remove an item if it is present"""
+        entry = self._keys.pop(item_id, None)
+        if entry is not None:
+            self._entries.pop(bisect_left(self._entries, entry))
+
+    def search(self, prefix: str, limit: int = 25) -> List[Tuple[int, str]]:
+        """Return up to `limit` (id, name) pairs whose name starts with prefix"""
+        prefix = prefix.casefold()
+        matches = []
+        i = bisect_left(self._entries, (prefix,))
+        while i < len(self._entries) and len(matches) < limit:
+            key, item_id, name = self._entries[i]
+            if not key.startswith(prefix):
+                break
+            matches.append((item_id, name))
+            i += 1
+        return matches
 
 class HabitsDatabase:
     def __init__(self):
         os.makedirs('.db', exist_ok=True)
         self.conn = sqlite3.connect('.db/habits.db')
         self.cursor = self.conn.cursor()
+        # Per-user autocomplete indexes, loaded on first lookup and kept in sync by the write methods.
+        # Least recently used indexes are evicted once MAX_CACHED_INDEXES users are cached.
+        self._habit_indexes: "OrderedDict[str, PrefixIndex]" = OrderedDict()
+        self._todo_indexes: "OrderedDict[str, PrefixIndex]" = OrderedDict()
         self._create_tables()
 
     def _create_tables(self):
@@ -77,6 +118,8 @@ class HabitsDatabase:
                 VALUES (?, ?, ?, ?, ?)
             ''', (user_id, name, frequency, description, reminder_time))
             self.conn.commit()
+            if user_id in self._habit_indexes:
+                self._habit_indexes[user_id].add(self.cursor.lastrowid, name)
             return True
         except sqlite3.IntegrityError:
             return False
@@ -99,7 +142,77 @@ class HabitsDatabase:
         ''', (habit_id,))
         self.conn.commit()
         return True
-    
+
+    def complete_habits(self, user_id: str, habit_ids: Optional[List[int]] = None) -> List[Dict]:
+        """
+        Mark several of a user's habits as completed for today in one transaction.
+        If habit_ids is None, every habit that is due today is completed instead.
+        Returns the newly completed habits with their updated streaks.
+        """
+        today = date.today().isoformat()
+        query = '''
+            SELECT habit_id, habit_name, frequency
+            FROM habits h
+            WHERE user_id = ?
+        '''
+        params: list = [user_id]
+
+        if habit_ids is None:
+            # Due habits have no completion in their current day/week/month
+            query += '''
+                AND NOT EXISTS (
+                    SELECT 1 FROM habit_completions c
+                    WHERE c.habit_id = h.habit_id AND (
+                        (h.frequency = 'daily' AND DATE(c.completed_at) = ?)
+                        OR (h.frequency = 'weekly' AND DATE(c.completed_at) > DATE(?, '-7 days'))
+                        OR (h.frequency = 'monthly' AND strftime('%Y-%m', c.completed_at) = strftime('%Y-%m', ?))
+                    )
+                )
+            '''
+            params += [today, today, today]
+        else:
+            if not habit_ids:
+                return []
+            placeholders = ', '.join('?' * len(habit_ids))
+            query += f'''
+                AND habit_id IN ({placeholders})
+                AND NOT EXISTS (
+                    SELECT 1 FROM habit_completions c
+                    WHERE c.habit_id = h.habit_id AND DATE(c.completed_at) = ?
+                )
+            '''
+            params += list(habit_ids) + [today]
+
+        self.cursor.execute(query, params)
+        habits = self.cursor.fetchall()
+        if not habits:
+            return []
+
+        self.cursor.executemany('''
+            INSERT INTO habit_completions (habit_id)
+            VALUES (?)
+        ''', [(row[0],) for row in habits])
+        self.conn.commit()
+
+        # Fetch completion history for all completed habits at once to compute streaks
+        placeholders = ', '.join('?' * len(habits))
+        self.cursor.execute(f'''
+            SELECT habit_id, DATE(completed_at) as completion_date
+            FROM habit_completions
+            WHERE habit_id IN ({placeholders})
+            ORDER BY completed_at DESC
+        ''', [row[0] for row in habits])
+
+        completions: Dict[int, List[str]] = {}
+        for habit_id, completion_date in self.cursor.fetchall():
+            completions.setdefault(habit_id, []).append(completion_date)
+
+        return [{
+            'habit_id': habit_id,
+            'habit_name': habit_name,
+            'streak': self._calculate_streak(frequency, completions.get(habit_id, []))
+        } for habit_id, habit_name, frequency in habits]
+
     def get_habit_streak(self, habit_id: int) -> int:
         """Calculate current streak for a habit"""
         self.cursor.execute('''
@@ -111,7 +224,6 @@ class HabitsDatabase:
             return 0
             
         frequency = frequency[0]
-        today = date.today()
         
         # Get all completion dates for this habit
         self.cursor.execute('''
@@ -122,11 +234,15 @@ class HabitsDatabase:
         ''', (habit_id,))
         
         completions = [row[0] for row in self.cursor.fetchall()]
+        return self._calculate_streak(frequency, completions)
+
+    def _calculate_streak(self, frequency: str, completions: List[str]) -> int:
+        """Count the current streak from completion dates ordered newest first"""
         if not completions:
             return 0
             
         streak = 0
-        current_date = today
+        current_date = date.today()
         
         # Count consecutive days/weeks/months of completion
         for completion in completions:
@@ -183,7 +299,10 @@ class HabitsDatabase:
             VALUES (?, ?, ?, ?, ?)
         ''', (user_id, title, description, due_date, priority))
         self.conn.commit()
-        return self.cursor.lastrowid
+        todo_id = self.cursor.lastrowid
+        if user_id in self._todo_indexes:
+            self._todo_indexes[user_id].add(todo_id, title)
+        return todo_id
     
     def complete_todo(self, todo_id: int) -> bool:
         """Mark a todo as completed"""
@@ -193,7 +312,17 @@ class HabitsDatabase:
             WHERE todo_id = ? AND completed = FALSE
         ''', (todo_id,))
         self.conn.commit()
-        return self.cursor.rowcount > 0
+        if self.cursor.rowcount == 0:
+            return False
+        # Completed todos are no longer offered as suggestions
+        if self._todo_indexes:
+            self.cursor.execute('''
+                SELECT user_id FROM todos WHERE todo_id = ?
+            ''', (todo_id,))
+            index = self._todo_indexes.get(self.cursor.fetchone()[0])
+            if index is not None:
+                index.remove(todo_id)
+        return True
     
     def get_user_todos(self, user_id: str, include_completed: bool = False) -> List[Dict]:
         """Get todos for a user"""
@@ -245,6 +374,7 @@ class HabitsDatabase:
         if deleted_count > 0:
             self.cursor.execute("UPDATE sqlite_sequence SET seq = 0 WHERE name = 'habits'")
         self.conn.commit()
+        self._habit_indexes.pop(user_id, None)
         return deleted_count
 
     def clear_todos(self, user_id: str) -> int:
@@ -259,8 +389,47 @@ class HabitsDatabase:
       if deleted_count > 0:
         self.cursor.execute("UPDATE sqlite_sequence SET seq = 0 WHERE name = 'todos'")
       self.conn.commit()
+      self._todo_indexes.pop(user_id, None)
       return deleted_count
 
+    def search_user_habits(self, user_id: str, prefix: str, limit: int = 25) -> List[Tuple[int, str]]:
+        """Return (habit_id, habit_name) pairs for a user's habits matching a name prefix"""
+        index = self._habit_indexes.get(user_id)
+        if index is None:
+            index = PrefixIndex()
+            self.cursor.execute('''
+                SELECT habit_id, habit_name FROM habits
+                WHERE user_id = ?
+            ''', (user_id,))
+            for habit_id, habit_name in self.cursor.fetchall():
+                index.add(habit_id, habit_name)
+            self._cache_index(self._habit_indexes, user_id, index)
+        else:
+            self._habit_indexes.move_to_end(user_id)
+        return index.search(prefix, limit)
+
+    def search_user_todos(self, user_id: str, prefix: str, limit: int = 25) -> List[Tuple[int, str]]:
+        """Return (todo_id, title) pairs for a user's pending todos matching a title prefix"""
+        index = self._todo_indexes.get(user_id)
+        if index is None:
+            index = PrefixIndex()
+            self.cursor.execute('''
+                SELECT todo_id, title FROM todos
+                WHERE user_id = ? AND completed = FALSE
+            ''', (user_id,))
+            for todo_id, title in self.cursor.fetchall():
+                index.add(todo_id, title)
+            self._cache_index(self._todo_indexes, user_id, index)
+        else:
+            self._todo_indexes.move_to_end(user_id)
+        return index.search(prefix, limit)
+
+    def _cache_index(self, cache: "OrderedDict[str, PrefixIndex]", user_id: str, index: PrefixIndex):
+        """Store a user's index, evicting the least recently used one if the cache is full"""
+        cache[user_id] = index
+        if len(cache) > MAX_CACHED_INDEXES:
+            cache.popitem(last=False)
+
 
     def __del__(self):
         """Close database connection when object is destroyed"""